@@ -1,11 +1,71 @@
+import collections
+import functools
+import math
+import operator
 import pygame
+import pygame.freetype
 import random
 
 from settings import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, EVENT_WAIT_TIMEOUT,
     WHITE, BLACK, RED, GREEN, GRAY
 )
 
+# Cards are single ints: rank in the low nibble, suit index in the high nibble
+# (card = rank | suit << 4), so the deck and both hands are plain bytearrays.
+RANK_STR = ('', 'A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+SUIT_STR = ('♣', '♦', '♥', '♠')
+
+# Ordered 52-card deck, built once at import (1=Ace, 11=Jack, 12=Queen, 13=King)
+_DECK_TEMPLATE = bytes(
+    rank | suit << 4 for suit in range(len(SUIT_STR)) for rank in range(1, 14)
+)
+CARD_STR = {card: RANK_STR[card & 0x0F] + SUIT_STR[card >> 4] for card in _DECK_TEMPLATE}
+
+# Blackjack value of each rank (index 0 unused); Aces count as 1 here
+RANK_VALUE = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+
+# Every message a round can end with; each is pre-rendered once at startup
+WINNER_PLAYER_BUST = "You busted! Dealer wins."
+WINNER_PLAYER_21 = "You hit 21! You win."
+WINNER_DEALER_BUST = "Dealer busted! You win."
+WINNER_PLAYER = "You win!"
+WINNER_DEALER = "Dealer wins."
+WINNER_TIE = "It's a tie!"
+
+# Characters pre-rendered into the glyph atlas used for the hand lines
+GLYPH_CHARS = "0123456789AJQK♣♦♥♠?,:() YourHandDealersc"
+
+
+def _render_line(font, text, color, width=None):
+    """
+    Render text into a surface one line tall with the baseline at the font's
+    ascender. freetype crops its output to the ink, so this restores the
+    line-top layout every piece of text on screen is positioned with.
+    """
+    surf, rect = font.render(text, color)
+    if width is None:
+        width = rect.right
+    cell = pygame.Surface((width, font.get_sized_height()), pygame.SRCALPHA)
+    cell.blit(surf, (rect.x, font.get_sized_ascender() - rect.y))
+    return cell
+
+
+@functools.lru_cache(maxsize=128)
+def _render_text(font, text, color):
+    """
+    Render text once per (font, text, color) and reuse the Surface afterwards.
+    Fonts hash by identity, so each font object gets its own cache entries.
+    """
+    return _render_line(font, text, color)
+
+
+# Shared look of a group of buttons: size, font and colors
+ButtonTemplate = collections.namedtuple(
+    "ButtonTemplate", ["w", "h", "font", "bg_color", "text_color"]
+)
+
+
 class Button:
     """
     A simple Button class to draw a rectangle with text and detect clicks.
@@ -18,10 +78,18 @@ class Button:
         self.bg_color = bg_color
         self.text_color = text_color
 
-        # Pre-render the text for this button
-        self.text_surf = self.font.render(self.text, True, self.text_color)
+        # Pre-render the text for this button (shared with any identical label)
+        self.text_surf = _render_text(self.font, self.text, self.text_color)
         self.text_rect = self.text_surf.get_rect(center=self.rect.center)
 
+    @classmethod
+    def from_template(cls, x, y, text, template):
+        """
+        Create a button at (x, y) using the size, font and colors of template.
+        """
+        return cls(x, y, template.w, template.h, text, template.font,
+                   bg_color=template.bg_color, text_color=template.text_color)
+
     def draw(self, surface):
         """
         Draw the button (rectangle + text).
@@ -39,114 +107,138 @@ class Button:
 class Game:
     def __init__(self):
         pygame.init()
+        pygame.freetype.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Pygame Blackjack (Dealer's Hand Hidden + Instant Win on 21)")
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.dirty = True  # Redraw only when something on screen changed
 
         # Set up fonts for rendering text
-        self.font_large = pygame.font.SysFont("arial", 36, bold=True)
-        self.font_small = pygame.font.SysFont("arial", 24, bold=True)
+        self.font_large = pygame.freetype.SysFont("arial", 36, bold=True)
+        self.font_small = pygame.freetype.SysFont("arial", 24, bold=True)
+
+        # Pre-render the text that never changes
+        self.surf_title = _render_line(self.font_large, "Blackjack!", BLACK)
+        self.surf_restart_prompt = _render_line(
+            self.font_small, "Click 'Restart' to play again.", BLACK)
+        self.surf_player_prompt = _render_line(
+            self.font_small, "Your turn! Click 'Hit' or 'Stand'.", BLACK)
+
+        self.winner_surfaces = {
+            text: _render_line(self.font_small, text, RED)
+            for text in (WINNER_PLAYER_BUST, WINNER_PLAYER_21, WINNER_DEALER_BUST,
+                         WINNER_PLAYER, WINNER_DEALER, WINNER_TIE)
+        }
+
+        # Glyph atlas for the hand lines, which change a few characters at a time
+        self.glyphs = {ch: self.render_glyph(ch) for ch in GLYPH_CHARS}
 
         # Create the buttons
-        self.btn_hit = Button(
-            x=100, y=500, w=100, h=40,
-            text="Hit", font=self.font_small,
-            bg_color=GREEN, text_color=BLACK
-        )
-        self.btn_stand = Button(
-            x=300, y=500, w=100, h=40,
-            text="Stand", font=self.font_small,
+        action_button = ButtonTemplate(
+            w=100, h=40, font=self.font_small,
             bg_color=GREEN, text_color=BLACK
         )
-        self.btn_restart = Button(
-            x=500, y=500, w=100, h=40,
-            text="Restart", font=self.font_small,
-            bg_color=GRAY, text_color=BLACK
-        )
+        restart_button = action_button._replace(bg_color=GRAY)
+
+        self.btn_hit = Button.from_template(100, 500, "Hit", action_button)
+        self.btn_stand = Button.from_template(300, 500, "Stand", action_button)
+        self.btn_restart = Button.from_template(500, 500, "Restart", restart_button)
+
+        # The title and buttons never change, so draw them once into a backdrop
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.fill(WHITE)
+        self.background.blit(self.surf_title, (20, 20))
+        self.btn_hit.draw(self.background)
+        self.btn_stand.draw(self.background)
+        self.btn_restart.draw(self.background)
 
         # Start a new game/round
         self.new_round()
 
     def new_round(self):
         """Set up a new round of Blackjack."""
-        self.deck = self.make_deck()
-        random.shuffle(self.deck)
-
-        self.player_hand = [self.deck.pop(), self.deck.pop()]
-        self.dealer_hand = [self.deck.pop(), self.deck.pop()]
+        self.deck = bytearray(random.sample(_DECK_TEMPLATE, len(_DECK_TEMPLATE)))
+
+        # Each hand keeps a tally of how many cards of each rank it holds
+        self.player_hand = bytearray()
+        self.dealer_hand = bytearray()
+        self.player_rank_counts = [0] * 14
+        self.dealer_rank_counts = [0] * 14
+        for _ in range(2):
+            self.deal(self.player_hand, self.player_rank_counts)
+        for _ in range(2):
+            self.deal(self.dealer_hand, self.dealer_rank_counts)
+
+        # Scores are cached and only recomputed when a hand changes
+        self.player_score = self.score_counts(self.player_rank_counts)
+        self.dealer_score = self.score_counts(self.dealer_rank_counts)
 
         self.round_over = False
-        self.winner_text = ""
+        self.winner_surf = None
         self.game_state = "PLAYER_TURN"  # or "DEALER_TURN" / "DONE"
+        self._rebuild_display_strings()
+        self.dirty = True
 
         # OPTIONAL: Check if player starts with 21 (natural Blackjack).
-        # If so, instantly end the round:
+        # If so, instantly end the round (add the message to the
+        # pre-rendered winner_surfaces in __init__ first):
         #
-        # if self.score_hand(self.player_hand) == 21:
+        # if self.player_score == 21:
         #     self.round_over = True
         #     self.game_state = "DONE"
-        #     self.winner_text = "Blackjack! You win immediately."
-
-    def make_deck(self):
-        suits = ['♣', '♦', '♥', '♠']
-        deck = []
-        for suit in suits:
-            for rank in range(1, 14):  # 1=Ace, 11=Jack, 12=Queen, 13=King
-                deck.append((rank, suit))
-        return deck
-
-    def card_to_string(self, card):
-        rank, suit = card
-        if rank == 1:
-            rank_str = 'A'
-        elif rank == 11:
-            rank_str = 'J'
-        elif rank == 12:
-            rank_str = 'Q'
-        elif rank == 13:
-            rank_str = 'K'
-        else:
-            rank_str = str(rank)
-        return f"{rank_str}{suit}"
-
-    def score_hand(self, hand):
-        total = 0
-        aces = 0
-
-        for card in hand:
-            rank, _ = card
-            if rank > 10:
-                total += 10  # J, Q, K
-            elif rank == 1:
-                aces += 1
-                total += 1
-            else:
-                total += rank
-
-        # Convert Aces from 1 to 11 if possible
-        while aces > 0:
-            if total + 10 <= 21:
-                total += 10
-            aces -= 1
+        #     self.set_winner("Blackjack! You win immediately.")
+        #     self._rebuild_display_strings()
+
+    def hand_to_string(self, hand):
+        return ", ".join([CARD_STR[card] for card in hand])
+
+    def deal(self, hand, rank_counts):
+        """Move the top card of the deck into hand and update its rank tally."""
+        card = self.deck.pop()
+        hand.append(card)
+        rank_counts[card & 0x0F] += 1
+
+    def score_counts(self, rank_counts):
+        """Score a hand from its 14-slot rank tally (as kept up by deal())."""
+        # Dot product of the rank tally with the rank values
+        total = sum(map(operator.mul, RANK_VALUE, rank_counts))
+        aces = rank_counts[1]
+
+        # At most one Ace can count as 11 (two would already make 22)
+        if aces and total + 10 <= 21:
+            total += 10
 
         return total
 
     def run(self):
         while self.running:
+            # Draw before handling events so pending changes are shown
+            # before the loop goes to sleep waiting for input
+            if self.dirty:
+                self.draw()
+                self.dirty = False
             self.clock.tick(FPS)
             self.handle_events()
             self.update()
-            self.draw()
         self.quit()
 
     def handle_events(self):
         """Handle user clicks, window events, etc."""
-        for event in pygame.event.get():
+        # Nothing changes without input, so sleep until an event arrives
+        # (or the timeout elapses) instead of spinning the loop
+        events = [pygame.event.wait(EVENT_WAIT_TIMEOUT)]
+        events.extend(pygame.event.get())
+
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
 
+            elif event.type == pygame.VIDEOEXPOSE:
+                # Window was uncovered/restored; its contents must be repainted
+                self.dirty = True
+
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left mouse button
                     mouse_pos = event.pos
@@ -160,90 +252,116 @@ class Game:
                         if self.game_state == "PLAYER_TURN":
                             if self.btn_hit.is_clicked(mouse_pos):
                                 # Player draws a new card
-                                self.player_hand.append(self.deck.pop())
+                                self.deal(self.player_hand, self.player_rank_counts)
+                                self.player_score = self.score_counts(self.player_rank_counts)
+                                self.dirty = True
 
-                                player_total = self.score_hand(self.player_hand)
                                 # Check bust
-                                if player_total > 21:
+                                if self.player_score > 21:
                                     self.round_over = True
                                     self.game_state = "DONE"
-                                    self.winner_text = "You busted! Dealer wins."
+                                    self.set_winner(WINNER_PLAYER_BUST)
                                 # NEW: Instantly win if hitting exactly 21
-                                elif player_total == 21:
+                                elif self.player_score == 21:
                                     self.round_over = True
                                     self.game_state = "DONE"
-                                    self.winner_text = "You hit 21! You win."
+                                    self.set_winner(WINNER_PLAYER_21)
                                 # Otherwise, continue as normal
 
+                                self._rebuild_display_strings()
+
                             elif self.btn_stand.is_clicked(mouse_pos):
                                 self.game_state = "DEALER_TURN"
+                                self.dirty = True
 
     def update(self):
         if self.game_state == "DEALER_TURN":
-            dealer_score = self.score_hand(self.dealer_hand)
-            if dealer_score < 17:
-                self.dealer_hand.append(self.deck.pop())
-            else:
-                self.game_state = "DONE"
-                self.round_over = True
-                self.determine_winner()
+            # Dealer draws to 17 in one go rather than one card per frame
+            while self.dealer_score < 17:
+                self.deal(self.dealer_hand, self.dealer_rank_counts)
+                self.dealer_score = self.score_counts(self.dealer_rank_counts)
+
+            self.game_state = "DONE"
+            self.round_over = True
+            self.determine_winner()
+            self._rebuild_display_strings()
+            self.dirty = True
 
     def determine_winner(self):
-        player_score = self.score_hand(self.player_hand)
-        dealer_score = self.score_hand(self.dealer_hand)
-
-        if dealer_score > 21:
-            self.winner_text = "Dealer busted! You win."
-        elif player_score > dealer_score:
-            self.winner_text = "You win!"
-        elif player_score < dealer_score:
-            self.winner_text = "Dealer wins."
+        if self.dealer_score > 21:
+            self.set_winner(WINNER_DEALER_BUST)
+        elif self.player_score > self.dealer_score:
+            self.set_winner(WINNER_PLAYER)
+        elif self.player_score < self.dealer_score:
+            self.set_winner(WINNER_DEALER)
         else:
-            self.winner_text = "It's a tie!"
-
-    def draw_text(self, text, x, y, font=None, color=BLACK):
-        if font is None:
-            font = self.font_small
-        surface = font.render(text, True, color)
-        self.screen.blit(surface, (x, y))
-
-    def draw(self):
-        self.screen.fill(WHITE)
+            self.set_winner(WINNER_TIE)
 
-        # Title
-        self.draw_text("Blackjack!", 20, 20, font=self.font_large)
+    def set_winner(self, text):
+        """Show the pre-rendered surface for the round's result."""
+        self.winner_surf = self.winner_surfaces[text]
 
-        # Player hand
-        player_cards_str = ", ".join(self.card_to_string(c) for c in self.player_hand)
-        player_score = self.score_hand(self.player_hand)
-        self.draw_text(f"Your Hand: {player_cards_str} (score: {player_score})", 20, 100)
+    def _rebuild_display_strings(self):
+        """
+        Rebuild the hand lines shown by draw(). Call whenever a hand changes
+        or the round moves past the player's turn (revealing the dealer).
+        """
+        self.player_display_str = (
+            f"Your Hand: {self.hand_to_string(self.player_hand)} (score: {self.player_score})"
+        )
 
-        # Dealer hand (hide second card if still player's turn)
+        # Dealer hand (hide everything but the first card if still player's turn)
         if self.game_state == "PLAYER_TURN" and not self.round_over:
-            shown_dealer_cards = [self.card_to_string(self.dealer_hand[0])]
-            if len(self.dealer_hand) > 1:
-                shown_dealer_cards.extend(["??"] * (len(self.dealer_hand) - 1))
+            dealer_cards_str = CARD_STR[self.dealer_hand[0]] + ", ??" * (len(self.dealer_hand) - 1)
             dealer_score_display = ""
         else:
-            shown_dealer_cards = [self.card_to_string(c) for c in self.dealer_hand]
-            dealer_score_display = f"(score: {self.score_hand(self.dealer_hand)})"
+            dealer_cards_str = self.hand_to_string(self.dealer_hand)
+            dealer_score_display = f"(score: {self.dealer_score})"
+        self.dealer_display_str = f"Dealer Hand: {dealer_cards_str} {dealer_score_display}"
+
+    def render_glyph(self, ch, font=None, color=BLACK):
+        """
+        Render a single character into a line-height cell aligned on the
+        baseline, returning (surface, advance width). The advance is kept as
+        a float so rounding errors don't add up along a line.
+        """
+        if font is None:
+            font = self.font_small
+        rect = font.get_rect(ch)
+        metrics = font.get_metrics(ch)[0]
+        width = metrics[4] if metrics else float(rect.width)
 
-        dealer_cards_str = ", ".join(shown_dealer_cards)
-        self.draw_text(f"Dealer Hand: {dealer_cards_str} {dealer_score_display}", 20, 200)
+        cell = _render_line(font, ch, color, width=max(math.ceil(width), rect.right))
+        return cell, width
 
-        # Draw buttons
-        self.btn_hit.draw(self.screen)
-        self.btn_stand.draw(self.screen)
-        self.btn_restart.draw(self.screen)
+    def draw_text_atlas(self, text, x, y):
+        """
+        Draw text by blitting pre-rendered glyphs from the atlas, so no
+        rasterization happens on the hot path.
+        """
+        glyphs = self.glyphs
+        for ch in text:
+            glyph = glyphs.get(ch)
+            if glyph is None:
+                # Not in the pre-built set; render it once and keep it
+                glyph = glyphs[ch] = self.render_glyph(ch)
+            surface, width = glyph
+            self.screen.blit(surface, (round(x), y))
+            x += width
+
+    def draw(self):
+        # Title and buttons
+        self.screen.blit(self.background, (0, 0))
+
+        # Hands (strings are rebuilt only when they change)
+        self.draw_text_atlas(self.player_display_str, 20, 100)
+        self.draw_text_atlas(self.dealer_display_str, 20, 200)
 
         if self.round_over:
-            self.draw_text(self.winner_text, 20, 300, color=RED)
-            self.draw_text("Click 'Restart' to play again.", 20, 340)
-        else:
-            if self.game_state == "PLAYER_TURN":
-                self.draw_text("Your turn! Click 'Hit' or 'Stand'.", 20, 300)
-            elif self.game_state == "DEALER_TURN":
-                self.draw_text("Dealer's turn... (please wait)", 20, 300)
+            self.screen.blit(self.winner_surf, (20, 300))
+            self.screen.blit(self.surf_restart_prompt, (20, 340))
+        elif self.game_state == "PLAYER_TURN":
+            self.screen.blit(self.surf_player_prompt, (20, 300))
 
         pygame.display.flip()
 
@@ -4,8 +4,11 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
-# Frames per second
-FPS = 60
+# Frames per second (no animation, so 30 is plenty for a click-driven game)
+FPS = 30
+
+# How long the event loop may sleep waiting for input (milliseconds)
+EVENT_WAIT_TIMEOUT = 500
 
 # Colors (R, G, B)
 WHITE = (255, 255, 255)